@@ -1,14 +1,26 @@
+import struct
+
 import attr
 
 from . import models as gp
 from .iobase import GPFileBase
 from .utils import clamp
 
+# Instrument, volume, balance, chorus, reverb, phaser, tremolo, and 2 blank
+# bytes kept for backward compatibility with version 3.0
+_MIDI_CHANNEL = struct.Struct('<i6b2x')
+# Position, value, and vibrato of a bend point
+_BEND_POINT = struct.Struct('<ii?')
+
+_MIN_VELOCITY = gp.Velocities.minVelocity
+_VELOCITY_INCREMENT = gp.Velocities.velocityIncrement
+
 
+@attr.s(slots=True)
 class GP3File(GPFileBase):
     """A reader for GuitarPro 3 files."""
 
-    _tripletFeel = gp.TripletFeel.none
+    _tripletFeel = attr.ib(default=gp.TripletFeel.none, init=False, repr=False)
 
     # Reading
     # =======
@@ -131,19 +143,18 @@ class GP3File(GPFileBase):
             newChannel = gp.MidiChannel()
             newChannel.channel = i
             newChannel.effectChannel = i
-            instrument = self.readInt()
+            (instrument, volume, balance, chorus,
+             reverb, phaser, tremolo) = self.readStruct(_MIDI_CHANNEL)
             if newChannel.isPercussionChannel and instrument == -1:
                 instrument = 0
             newChannel.instrument = instrument
-            newChannel.volume = self.toChannelShort(self.readSignedByte())
-            newChannel.balance = self.toChannelShort(self.readSignedByte())
-            newChannel.chorus = self.toChannelShort(self.readSignedByte())
-            newChannel.reverb = self.toChannelShort(self.readSignedByte())
-            newChannel.phaser = self.toChannelShort(self.readSignedByte())
-            newChannel.tremolo = self.toChannelShort(self.readSignedByte())
+            newChannel.volume = self.toChannelShort(volume)
+            newChannel.balance = self.toChannelShort(balance)
+            newChannel.chorus = self.toChannelShort(chorus)
+            newChannel.reverb = self.toChannelShort(reverb)
+            newChannel.phaser = self.toChannelShort(phaser)
+            newChannel.tremolo = self.toChannelShort(tremolo)
             channels.append(newChannel)
-            # Backward compatibility with version 3.0
-            self.skip(2)
         return channels
 
     def toChannelShort(self, data):
@@ -562,10 +573,7 @@ class GP3File(GPFileBase):
         chord.name = self.readIntByteSizeString()
         chord.firstFret = self.readInt()
         if chord.firstFret:
-            for i in range(6):
-                fret = self.readInt()
-                if i < len(chord.strings):
-                    chord.strings[i] = fret
+            self.readChordFrets(chord, 6)
 
     def readNewChord(self, chord):
         """Read new-style (GP4) chord diagram.
@@ -639,11 +647,7 @@ class GP3File(GPFileBase):
         chord.ninth = gp.ChordAlteration(self.readInt())
         chord.eleventh = gp.ChordAlteration(self.readInt())
         chord.firstFret = self.readInt()
-        for i in range(6):
-            fret = self.readInt()
-            if i < len(chord.strings):
-                chord.strings[i] = fret
-        chord.barres = []
+        self.readChordFrets(chord, 6)
         barresCount = self.readInt()
         barreFrets = self.readInt(2)
         barreStarts = self.readInt(2)
@@ -654,6 +658,16 @@ class GP3File(GPFileBase):
         chord.omissions = self.readBool(7)
         self.skip(1)
 
+    def readChordFrets(self, chord, count):
+        """Read *count* frets of chord diagram.
+
+        Frets are stored as :ref:`Ints <int>`. Only as many of them are
+        stored in the chord as it has strings.
+        """
+        frets = self.readInt(count)
+        stringCount = min(len(chord.strings), count)
+        chord.strings[:stringCount] = frets[:stringCount]
+
     def readBeatEffects(self, noteEffect):
         """Read beat effects.
 
@@ -900,7 +914,7 @@ class GP3File(GPFileBase):
         note.string = guitarString.number
         note.effect.ghostNote = bool(flags & 0x04)
         if flags & 0x20:
-            note.type = gp.NoteType(self.readByte())
+            note.type = self.readNoteType()
         if flags & 0x01:
             note.duration = self.readSignedByte()
             note.tuplet = self.readSignedByte()
@@ -915,8 +929,8 @@ class GP3File(GPFileBase):
                 value = fret
             note.value = max(0, min(99, value))
         if flags & 0x80:
-            note.effect.leftHandFinger = gp.Fingering(self.readSignedByte())
-            note.effect.rightHandFinger = gp.Fingering(self.readSignedByte())
+            note.effect.leftHandFinger = self.readFingering()
+            note.effect.rightHandFinger = self.readFingering()
         if flags & 0x08:
             note.effect = self.readNoteEffects(note)
             if note.effect.isHarmonic and isinstance(note.effect.harmonic, gp.TappedHarmonic):
@@ -925,9 +939,7 @@ class GP3File(GPFileBase):
 
     def unpackVelocity(self, dyn):
         """Convert Guitar Pro dynamic value to raw MIDI velocity."""
-        return (gp.Velocities.minVelocity +
-                gp.Velocities.velocityIncrement * dyn -
-                gp.Velocities.velocityIncrement)
+        return _MIN_VELOCITY + _VELOCITY_INCREMENT * (dyn - 1)
 
     def getTiedNoteValue(self, stringIndex, track):
         """Get note value of tied note."""
@@ -991,13 +1003,13 @@ class GP3File(GPFileBase):
           * Vibrato: :ref:`bool`.
         """
         bendEffect = gp.BendEffect()
-        bendEffect.type = gp.BendType(self.readSignedByte())
+        bendEffect.type = self.readBendType()
         bendEffect.value = self.readInt()
         pointCount = self.readInt()
         for _ in range(pointCount):
-            position = round(self.readInt() * gp.BendEffect.maxPosition / GPFileBase.bendPosition)
-            value = round(self.readInt() * gp.BendEffect.semitoneLength / GPFileBase.bendSemitone)
-            vibrato = self.readBool()
+            position, value, vibrato = self.readStruct(_BEND_POINT)
+            position = round(position * gp.BendEffect.maxPosition / GPFileBase.bendPosition)
+            value = round(value * gp.BendEffect.semitoneLength / GPFileBase.bendSemitone)
             bendEffect.points.append(gp.BendPoint(position, value, vibrato))
         if pointCount > 0:
             return bendEffect
@@ -1049,6 +1061,7 @@ class GP3File(GPFileBase):
             self.writeTracks(song.tracks)
             self.writeMeasures(song.tracks)
         self.writeInt(0)
+        self.flush()
 
     def writeInfo(self, song):
         self.writeIntByteSizeString(song.title)
@@ -1417,11 +1430,8 @@ class GP3File(GPFileBase):
 
     def packNoteFlags(self, note):
         flags = 0x00
-        try:
-            if note.duration is not None and note.tuplet is not None:
-                flags |= 0x01
-        except AttributeError:
-            pass
+        if note.duration is not None and note.tuplet is not None:
+            flags |= 0x01
         if note.effect.heavyAccentuatedNote:
             flags |= 0x02
         if note.effect.ghostNote:
@@ -1468,6 +1478,4 @@ class GP3File(GPFileBase):
         self.writeSignedByte(grace.transition.value)
 
     def packVelocity(self, velocity):
-        velocityIncrement = gp.Velocities.velocityIncrement
-        minVelocity = gp.Velocities.minVelocity
-        return int((velocity + velocityIncrement - minVelocity) / velocityIncrement)
+        return int((velocity + _VELOCITY_INCREMENT - _MIN_VELOCITY) / _VELOCITY_INCREMENT)
@@ -8,6 +8,8 @@ from .utils import clamp
 class GP4File(gp3.GP3File):
     """A reader for GuitarPro 4 files."""
 
+    __slots__ = ()
+
     # Reading
     # =======
 
@@ -183,11 +185,7 @@ class GP4File(gp3.GP3File):
         chord.ninth = gp.ChordAlteration(self.readByte())
         chord.eleventh = gp.ChordAlteration(self.readByte())
         chord.firstFret = self.readInt()
-        for i in range(7):
-            fret = self.readInt()
-            if i < len(chord.strings):
-                chord.strings[i] = fret
-        chord.barres = []
+        self.readChordFrets(chord, 7)
         barresCount = self.readByte()
         barreFrets = self.readByte(5)
         barreStarts = self.readByte(5)
@@ -492,6 +490,7 @@ class GP4File(gp3.GP3File):
             self.writeMeasureHeaders(song.tracks[0].measures)
             self.writeTracks(song.tracks)
             self.writeMeasures(song.tracks)
+        self.flush()
 
     def writeClipboard(self, clipboard):
         if clipboard is None:
@@ -721,11 +720,12 @@ class GP4File(gp3.GP3File):
             byte = harmonic.type
         else:
             if harmonic.pitch and harmonic.octave:
-                if harmonic.pitch.value == (note.realValue + 7) % 12 and harmonic.octave == gp.Octave.ottava:
+                realValue = note.realValue
+                if harmonic.pitch.value == (realValue + 7) % 12 and harmonic.octave == gp.Octave.ottava:
                     byte = 15
-                elif harmonic.pitch.value == note.realValue % 12 and harmonic.octave == gp.Octave.quindicesima:
+                elif harmonic.pitch.value == realValue % 12 and harmonic.octave == gp.Octave.quindicesima:
                     byte = 17
-                elif harmonic.pitch.value == note.realValue % 12 and harmonic.octave == gp.Octave.ottava:
+                elif harmonic.pitch.value == realValue % 12 and harmonic.octave == gp.Octave.ottava:
                     byte = 22
                 else:
                     byte = 22
@@ -1,12 +1,20 @@
+import struct
+
 import attr
 
 from . import models as gp
 from . import gp4
 
+# Page width and height, left, right, top and bottom padding, score size
+# proportion, header and footer elements
+_PAGE_SETUP = struct.Struct('<7ih')
+
 
 class GP5File(gp4.GP4File):
     """A reader for GuitarPro 5 files."""
 
+    __slots__ = ()
+
     # Reading
     # =======
 
@@ -192,14 +200,12 @@ class GP5File(gp4.GP4File):
           * pageNumber
         """
         setup = gp.PageSetup()
-        setup.pageSize = gp.Point(self.readInt(), self.readInt())
-        left = self.readInt()
-        right = self.readInt()
-        top = self.readInt()
-        bottom = self.readInt()
+        (width, height, left, right, top, bottom,
+         proportion, headerAndFooter) = self.readStruct(_PAGE_SETUP)
+        setup.pageSize = gp.Point(width, height)
         setup.pageMargin = gp.Padding(left, top, right, bottom)
-        setup.scoreSizeProportion = self.readInt() / 100
-        setup.headerAndFooter = self.readShort()
+        setup.scoreSizeProportion = proportion / 100
+        setup.headerAndFooter = headerAndFooter
         setup.title = self.readIntByteSizeString()
         setup.subtitle = self.readIntByteSizeString()
         setup.artist = self.readIntByteSizeString()
@@ -772,7 +778,7 @@ class GP5File(gp4.GP4File):
         note.effect.ghostNote = bool(flags & 0x04)
         note.effect.accentuatedNote = bool(flags & 0x40)
         if flags & 0x20:
-            note.type = gp.NoteType(self.readByte())
+            note.type = self.readNoteType()
         if flags & 0x10:
             dyn = self.readSignedByte()
             note.velocity = self.unpackVelocity(dyn)
@@ -784,8 +790,8 @@ class GP5File(gp4.GP4File):
                 value = fret
             note.value = value if 0 <= value < 100 else 0
         if flags & 0x80:
-            note.effect.leftHandFinger = gp.Fingering(self.readSignedByte())
-            note.effect.rightHandFinger = gp.Fingering(self.readSignedByte())
+            note.effect.leftHandFinger = self.readFingering()
+            note.effect.rightHandFinger = self.readFingering()
         if flags & 0x01:
             note.durationPercent = self.readDouble()
         flags2 = self.readByte()
@@ -931,6 +937,7 @@ class GP5File(gp4.GP4File):
             self.writeMeasureHeaders(song.tracks[0].measures)
             self.writeTracks(song.tracks)
             self.writeMeasures(song.tracks)
+        self.flush()
 
     def writeClipboard(self, clipboard):
         if clipboard is None:
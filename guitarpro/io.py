@@ -1,7 +1,6 @@
 import os
 from typing import Optional
 
-from .iobase import GPFileBase
 from .gp3 import GP3File
 from .gp4 import GP4File
 from .gp5 import GP5File
@@ -24,6 +23,13 @@ _GPFILES = {
     'CLIPBOARD GP 5.2': ((5, 2, 0), GP5File),
 }
 
+# Encoded version strings of known files. The padding after the version
+# string is not guaranteed to be zeroed, so only the payload is compared.
+_GPFILES_BYTES = {
+    versionString.encode('ascii'): (versionString,) + value
+    for versionString, value in _GPFILES.items()
+}
+
 _VERSIONS = {
     # (versionTuple, isClipboard): versionString,
     ((3, 0, 0), False): 'FICHIER GUITAR PRO v3.00',
@@ -78,6 +84,8 @@ def write(song: Song, stream, version: Optional[tuple] = None, encoding='cp1252'
     finally:
         if shouldClose:
             gpfile.close()
+        else:
+            gpfile.flush()
 
 
 def _open(song, stream, mode='rb', version=None, encoding=None):
@@ -94,9 +102,20 @@ def _open(song, stream, mode='rb', version=None, encoding=None):
         fp = stream
         filename = getattr(fp, 'name', '<file>')
 
+    buf = None
+    pos = 0
     if mode == 'rb':
-        gpfilebase = GPFileBase(fp, encoding)
-        versionString = gpfilebase.readVersion()
+        # GP files are small, so read the whole file at once and parse
+        # it from memory
+        data = fp.read()
+        buf = memoryview(data)
+        # Version is a byte-size string of size 30
+        versionBytes = data[1:1 + min(data[0], 30)] if data else b''
+        try:
+            versionString, version, GPFile = _GPFILES_BYTES[versionBytes]
+        except KeyError:
+            raise GPException(f"unsupported version '{versionBytes.decode(encoding, 'replace')}'")
+        pos = 31
     elif mode == 'wb':
         isClipboard = song.clipboard is not None
         if version is None:
@@ -104,9 +123,9 @@ def _open(song, stream, mode='rb', version=None, encoding=None):
         if version is None:
             version = guessVersionByExtension(filename)
         versionString = _VERSIONS[(version, isClipboard)]
+        version, GPFile = getVersionAndGPFile(versionString)
 
-    version, GPFile = getVersionAndGPFile(versionString)
-    gpfile = GPFile(fp, encoding, version=versionString, versionTuple=version)
+    gpfile = GPFile(fp, encoding, version=versionString, versionTuple=version, buf=buf, pos=pos)
     return gpfile, shouldClose
 
 
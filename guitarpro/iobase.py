@@ -1,6 +1,8 @@
+import codecs
 import struct
 import logging
 from contextlib import contextmanager
+from functools import lru_cache
 
 import attr
 
@@ -9,27 +11,66 @@ from . import models as gp
 
 logger = logging.getLogger(__name__)
 
-
-@attr.s
+_BYTE = struct.Struct('B')
+_SIGNED_BYTE = struct.Struct('b')
+_BOOL = struct.Struct('?')
+_SHORT = struct.Struct('<h')
+_INT = struct.Struct('<i')
+_FLOAT = struct.Struct('<f')
+_DOUBLE = struct.Struct('<d')
+_INT_BYTE = struct.Struct('<iB')
+
+# Bound unpackers of the hottest readers
+_unpackShort = _SHORT.unpack_from
+_unpackInt = _INT.unpack_from
+_unpackFloat = _FLOAT.unpack_from
+_unpackDouble = _DOUBLE.unpack_from
+
+# Looking up an enum member by value goes through the Enum metaclass,
+# which is several times slower than a cache hit. Readers do it for
+# every note, so memoize the lookups whose values fit in a byte.
+_noteType = lru_cache(maxsize=None)(gp.NoteType)
+_fingering = lru_cache(maxsize=None)(gp.Fingering)
+_bendType = lru_cache(maxsize=None)(gp.BendType)
+
+
+@attr.s(slots=True)
 class GPFileBase:
     data = attr.ib()
     encoding = attr.ib()
     version = attr.ib(default=None)
     versionTuple = attr.ib(default=None)
+    buf = attr.ib(default=None, repr=False)
+    pos = attr.ib(default=0, repr=False)
+    _out = attr.ib(default=attr.Factory(bytearray), init=False, repr=False)
+    _decode = attr.ib(init=False, repr=False)
 
     bendPosition = 60
     bendSemitone = 25
 
     _supportedVersions = []
 
-    _currentTrack = None
-    _currentMeasureNumber = None
-    _currentVoiceNumber = None
-    _currentBeatNumber = None
+    _currentTrack = attr.ib(default=None, init=False, repr=False)
+    _currentMeasureNumber = attr.ib(default=None, init=False, repr=False)
+    _currentVoiceNumber = attr.ib(default=None, init=False, repr=False)
+    _currentBeatNumber = attr.ib(default=None, init=False, repr=False)
+
+    @_decode.default
+    def _getDecoder(self):
+        # Looking up a codec by name on every string is slow
+        if self.encoding is not None:
+            return codecs.getdecoder(self.encoding)
 
     def close(self):
+        self.flush()
         self.data.close()
 
+    def flush(self):
+        """Write buffered output to the file at once."""
+        if self._out:
+            self.data.write(self._out)
+            del self._out[:]
+
     def __enter__(self):
         return self
 
@@ -40,68 +81,107 @@ class GPFileBase:
     # =======
 
     def skip(self, count):
-        return self.data.read(count)
+        self.pos += count
 
-    def read(self, fmt, count, default=None):
-        try:
-            data = self.data.read(count)
-            result = struct.unpack(fmt, data)
-            return result[0]
-        except struct.error:
-            if default is not None:
+    def read(self, struct_):
+        """Unpack a single value of compiled *struct_* from the buffer."""
+        value, = struct_.unpack_from(self.buf, self.pos)
+        self.pos += struct_.size
+        return value
+
+    def _readValues(self, struct_, count, default):
+        """Unpack *count* values of *struct_*, falling back to *default*
+        when the buffer is exhausted.
+        """
+        if default is None:
+            # Unpack the whole array at once
+            fmt = f'<{count}{struct_.format[-1]}'
+            values = struct.unpack_from(fmt, self.buf, self.pos)
+            self.pos += struct_.size * count
+            return values[0] if count == 1 else list(values)
+
+        def readOne():
+            try:
+                return self.read(struct_)
+            except struct.error:
                 return default
-            else:
-                raise
+
+        return readOne() if count == 1 else [readOne() for i in range(count)]
+
+    def readStruct(self, struct_):
+        """Unpack all values of compiled *struct_* from the buffer at
+        once.
+        """
+        result = struct_.unpack_from(self.buf, self.pos)
+        self.pos += struct_.size
+        return result
 
     def readByte(self, count=1, default=None):
         """Read 1 byte *count* times."""
-        args = ('B', 1)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            # Indexing the buffer is cheaper than unpacking a struct
+            pos = self.pos
+            self.pos = pos + 1
+            return self.buf[pos]
+        return self._readValues(_BYTE, count, default)
 
     def readSignedByte(self, count=1, default=None):
         """Read 1 signed byte *count* times."""
-        args = ('b', 1)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 1
+            value = self.buf[pos]
+            return value - 256 if value > 127 else value
+        return self._readValues(_SIGNED_BYTE, count, default)
 
     def readBool(self, count=1, default=None):
         """Read 1 byte *count* times as a boolean."""
-        args = ('?', 1)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 1
+            return self.buf[pos] != 0
+        return self._readValues(_BOOL, count, default)
 
     def readShort(self, count=1, default=None):
         """Read 2 little-endian bytes *count* times as a short integer."""
-        args = ('<h', 2)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 2
+            return _unpackShort(self.buf, pos)[0]
+        return self._readValues(_SHORT, count, default)
 
     def readInt(self, count=1, default=None):
         """Read 4 little-endian bytes *count* times as an integer."""
-        args = ('<i', 4)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 4
+            return _unpackInt(self.buf, pos)[0]
+        return self._readValues(_INT, count, default)
 
     def readFloat(self, count=1, default=None):
         """Read 4 little-endian bytes *count* times as a float."""
-        args = ('<f', 4)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 4
+            return _unpackFloat(self.buf, pos)[0]
+        return self._readValues(_FLOAT, count, default)
 
     def readDouble(self, count=1, default=None):
         """Read 8 little-endian bytes *count* times as a double."""
-        args = ('<d', 8)
-        return (self.read(*args, default=default) if count == 1 else
-                [self.read(*args, default=default) for i in range(count)])
+        if count == 1 and default is None:
+            pos = self.pos
+            self.pos = pos + 8
+            return _unpackDouble(self.buf, pos)[0]
+        return self._readValues(_DOUBLE, count, default)
 
     def readString(self, size, length=None):
         if length is None:
             length = size
         count = size if size > 0 else length
-        s = self.data.read(count)
-        ss = s[:(length if length >= 0 else size)]
-        return ss.decode(self.encoding)
+        real = min(length if length >= 0 else size, count)
+        pos = self.pos
+        self.pos = pos + count
+        return self._decode(self.buf[pos:pos + real])[0]
 
     def readByteSizeString(self, size):
         """Read length of the string stored in 1 byte and followed by character
@@ -120,10 +200,32 @@ class GPFileBase:
         followed by length of the string in 1 byte and finally followed by
         character bytes.
         """
-        d = self.readInt() - 1
-        return self.readByteSizeString(d)
+        buf = self.buf
+        pos = self.pos
+        size, length = _INT_BYTE.unpack_from(buf, pos)
+        size -= 1
+        pos += _INT_BYTE.size
+        count = size if size > 0 else length
+        self.pos = pos + count
+        return self._decode(buf[pos:pos + min(length, count)])[0]
+
+    def readNoteType(self):
+        """Read note type stored in 1 byte."""
+        return _noteType(self.readByte())
+
+    def readFingering(self):
+        """Read finger stored in 1 signed byte."""
+        return _fingering(self.readSignedByte())
+
+    def readBendType(self):
+        """Read bend type stored in 1 signed byte."""
+        return _bendType(self.readSignedByte())
 
     def readVersion(self):
+        if self.buf is None:
+            # Readers built directly on a stream parse the rest of it from
+            # memory
+            self.buf = memoryview(self.data.read())
         if self.version is None:
             self.version = self.readByteSizeString(30)
         return self.version
@@ -170,55 +272,77 @@ class GPFileBase:
     # =======
 
     def placeholder(self, count, byte=b'\x00'):
-        self.data.write(byte * count)
+        self._out += byte * count
 
     def writeByte(self, data):
-        packed = struct.pack('B', int(data))
-        self.data.write(packed)
+        try:
+            packed = _BYTE.pack(data)
+        except struct.error:
+            # Coerce the value only if it's not an integer already, e.g.
+            # a float
+            packed = _BYTE.pack(int(data))
+        self._out += packed
 
     def writeSignedByte(self, data):
-        packed = struct.pack('b', int(data))
-        self.data.write(packed)
+        try:
+            packed = _SIGNED_BYTE.pack(data)
+        except struct.error:
+            packed = _SIGNED_BYTE.pack(int(data))
+        self._out += packed
 
     def writeBool(self, data):
-        packed = struct.pack('?', bool(data))
-        self.data.write(packed)
+        self._out += _BOOL.pack(data)
 
     def writeShort(self, data):
-        packed = struct.pack('<h', int(data))
-        self.data.write(packed)
+        try:
+            packed = _SHORT.pack(data)
+        except struct.error:
+            packed = _SHORT.pack(int(data))
+        self._out += packed
 
     def writeInt(self, data):
-        packed = struct.pack('<i', int(data))
-        self.data.write(packed)
+        try:
+            packed = _INT.pack(data)
+        except struct.error:
+            packed = _INT.pack(int(data))
+        self._out += packed
 
     def writeFloat(self, data):
-        packed = struct.pack('<f', float(data))
-        self.data.write(packed)
+        try:
+            packed = _FLOAT.pack(data)
+        except struct.error:
+            packed = _FLOAT.pack(float(data))
+        self._out += packed
 
     def writeDouble(self, data):
-        packed = struct.pack('<d', float(data))
-        self.data.write(packed)
+        try:
+            packed = _DOUBLE.pack(data)
+        except struct.error:
+            packed = _DOUBLE.pack(float(data))
+        self._out += packed
 
     def writeString(self, data, size=None):
-        if size is None:
-            size = len(data)
-        self.data.write(data.encode(self.encoding))
-        self.placeholder(size - len(data))
+        encoded = data.encode(self.encoding)
+        if size is not None:
+            encoded = encoded.ljust(size, b'\x00')
+        self._out += encoded
 
     def writeByteSizeString(self, data, size=None):
+        encoded = data.encode(self.encoding)
+        length = len(encoded)
         if size is None:
-            size = len(data)
-        self.writeByte(len(data))
-        return self.writeString(data, size)
+            size = length
+        padding = max(size - length, 0)
+        self._out += struct.pack(f'B{length}s{padding}x', length, encoded)
 
     def writeIntSizeString(self, data):
         self.writeInt(len(data))
         return self.writeString(data)
 
     def writeIntByteSizeString(self, data):
-        self.writeInt(len(data) + 1)
-        return self.writeByteSizeString(data)
+        encoded = data.encode(self.encoding)
+        length = len(encoded)
+        self._out += struct.pack(f'<iB{length}s', length + 1, length, encoded)
 
     def writeVersion(self):
         self.writeByteSizeString(self.version, 30)
@@ -1,7 +1,8 @@
 from enum import Enum, IntEnum
 from fractions import Fraction
-from functools import partial
+from functools import lru_cache, partial
 from math import log
+from operator import attrgetter
 from typing import Any, Callable, List, Optional, Tuple, TypeVar, Union, overload
 
 import attr
@@ -40,10 +41,12 @@ class LenientEnum(Enum):
         return pseudo_member
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if (self.__class__ is other.__class__ and
                 self._name_ == other._name_ == 'unknown'):
             return self._value_ == other._value_
-        return super().__eq__(other)
+        return NotImplemented
 
     def __hash__(self):
         if self._name_ == 'unknown':
@@ -80,18 +83,45 @@ def hashableAttrs(cls=None, *, repr=True):  # noqa: E302
     if cls is None:
         return partial(hashableAttrs, repr=repr)
 
-    decorated = attr.s(cls, hash=True, repr=repr, auto_attribs=True)
-    origHash = decorated.__hash__
+    decorated = attr.s(cls, hash=False, repr=repr, auto_attribs=True, slots=True)
+    hashFields = [field for field in attr.fields(decorated)
+                  if (field.eq if field.hash is None else field.hash)]
+    names = [field.name for field in hashFields]
+    if len(names) > 1:
+        getValues = attrgetter(*names)
+    elif names:
+        getValue = attrgetter(*names)
+
+        def getValues(self):
+            return (getValue(self),)
+    else:
+        def getValues(self):
+            return ()
+    # Mix a per-class constant into the hash like attrs does, so models of
+    # different types with the same values don't collide
+    salt = hash(f'{decorated.__module__}.{decorated.__qualname__}')
+    # All values are fetched in one C-level call, then only the fields
+    # declared as lists or sets are converted to tuples
+    sequenceIndices = tuple(i for i, field in enumerate(hashFields)
+                            if getattr(field.type, '__origin__', None) in (list, set))
 
     def hash_(self):
-        toEvolve = {}
-        for field in attr.fields(self.__class__):
-            value = getattr(self, field.name)
-            if isinstance(value, (list, set)):
-                new_value = tuple(value)
-                toEvolve[field.name] = new_value
-        newSelf = attr.evolve(self, **toEvolve)
-        return origHash(newSelf)
+        values = getValues(self)
+        if sequenceIndices:
+            values = list(values)
+            for i in sequenceIndices:
+                value = values[i]
+                valueType = type(value)
+                if valueType is list or valueType is set:
+                    values[i] = tuple(value)
+            values = tuple(values)
+        try:
+            return hash((salt, values))
+        except TypeError:
+            # A list or set subclass, or one stored in a field that isn't
+            # declared as a sequence
+            return hash((salt, tuple(tuple(value) if isinstance(value, (list, set)) else value
+                                     for value in values)))
 
     decorated.__hash__ = hash_
     return decorated
@@ -192,14 +222,8 @@ class Lyrics:
     maxLineCount = 5
 
     def __str__(self):
-        full = ''
-        for line in self.lines:
-            if line is not None:
-                full += line.lyrics + '\n'
-        ret = full.strip()
-        ret = ret.replace('\n', ' ')
-        ret = ret.replace('\r', ' ')
-        return ret
+        full = '\n'.join(line.lyrics for line in self.lines if line is not None)
+        return full.strip().replace('\n', ' ').replace('\r', ' ')
 
 
 @hashableAttrs
@@ -300,7 +324,7 @@ class RSEMasterEffect:
 
     volume: float = 0
     reverb: float = 0
-    equalizer: RSEEqualizer = attr.Factory(RSEEqualizer)
+    equalizer: RSEEqualizer = attr.Factory(lambda: RSEEqualizer(knobs=[0.0] * 10))
 
     def __attrs_post_init__(self):
         if not self.equalizer.knobs:
@@ -336,6 +360,7 @@ class Song:
     measureHeaders: List['MeasureHeader'] = attr.Factory(lambda: [MeasureHeader()])
     tracks: List['Track'] = attr.Factory(lambda self: [Track(self)], takes_self=True)
     masterEffect: RSEMasterEffect = attr.Factory(RSEMasterEffect)
+    version: Optional[str] = attr.ib(default=None, hash=False, eq=False)
 
     _currentRepeatGroup: RepeatGroup = attr.ib(default=attr.Factory(RepeatGroup), hash=False, eq=False, repr=False)
 
@@ -396,7 +421,7 @@ class Tuplet:
     enters: int = 1
     times: int = 1
 
-    supportedTuplets = [
+    supportedTuplets = frozenset([
         (1, 1),
         (3, 2),
         (5, 4),
@@ -407,13 +432,13 @@ class Tuplet:
         (11, 8),
         (12, 8),
         (13, 8),
-    ]
+    ])
 
     def convertTime(self, time):
-        result = Fraction(time * self.times, self.enters)
-        if result.denominator == 1:
-            return result.numerator
-        return result
+        result, remainder = divmod(time * self.times, self.enters)
+        if remainder == 0:
+            return result
+        return Fraction(time * self.times, self.enters)
 
     def isSupported(self):
         return (self.enters, self.times) in self.supportedTuplets
@@ -447,40 +472,47 @@ class Duration:
 
     @property
     def time(self):
-        result = self.quarterTime * 4 // self.value
-        if self.isDotted:
-            result += result // 2
-        return self.tuplet.convertTime(result)
+        return _durationTime(self.value, self.isDotted, self.tuplet.enters, self.tuplet.times)
 
     @property
     def index(self):
-        index = 0
-        value = self.value
-        while True:
-            value = (value >> 1)
-            if value > 0:
-                index += 1
-            else:
-                break
-        return index
+        return self.value.bit_length() - 1
 
     @classmethod
     def fromTime(cls, time):
-        timeFrac = Fraction(time, cls.quarterTime * 4)
+        value, isDotted, enters, times = _durationFromTime(time)
+        return Duration(value, isDotted, Tuplet(enters, times))
+
+
+@lru_cache(maxsize=None)
+def _durationFromTime(time):
+    # Only a few dozen distinct times can be represented, so decompose
+    # each of them once and build fresh mutable instances from the result
+    timeFrac = Fraction(time, Duration.quarterTime * 4)
+    exp = int(log(timeFrac, 2))
+    value = 2 ** -exp
+    tuplet = Tuplet.fromFraction(timeFrac * value)
+    isDotted = False
+    if not tuplet.isSupported():
+        # Check if it's dotted
+        timeFrac = Fraction(time, Duration.quarterTime * 4) * Fraction(2, 3)
         exp = int(log(timeFrac, 2))
         value = 2 ** -exp
         tuplet = Tuplet.fromFraction(timeFrac * value)
-        isDotted = False
-        if not tuplet.isSupported():
-            # Check if it's dotted
-            timeFrac = Fraction(time, cls.quarterTime * 4) * Fraction(2, 3)
-            exp = int(log(timeFrac, 2))
-            value = 2 ** -exp
-            tuplet = Tuplet.fromFraction(timeFrac * value)
-            isDotted = True
-        if not tuplet.isSupported():
-            raise ValueError(f'cannot represent time {time} as a Guitar Pro duration')
-        return Duration(value, isDotted, tuplet)
+        isDotted = True
+    if not tuplet.isSupported():
+        raise ValueError(f'cannot represent time {time} as a Guitar Pro duration')
+    return value, isDotted, tuplet.enters, tuplet.times
+
+
+@lru_cache(maxsize=None)
+def _durationTime(value, isDotted, enters, times):
+    # Durations are mutated in place, so memoize time by the values it's
+    # computed from rather than on the instance
+    result = Duration.quarterTime * 4 // value
+    if isDotted:
+        result += result // 2
+    return Tuplet(enters, times).convertTime(result)
 
 
 @hashableAttrs
@@ -489,7 +521,7 @@ class TimeSignature:
 
     numerator: int = 4
     denominator: Duration = attr.Factory(Duration)
-    beams: List[int] = attr.Factory(list)
+    beams: List[int] = attr.Factory(lambda: [2, 2, 2, 2])
 
     def __attrs_post_init__(self):
         if not self.beams:
@@ -527,6 +559,8 @@ class MeasureHeader:
     tripletFeel: TripletFeel = TripletFeel.none
     direction: Optional[DirectionSign] = None
     fromDirection: Optional[DirectionSign] = None
+    song: Optional[Song] = attr.ib(default=None, hash=False, eq=False, repr=False)
+    repeatGroup: Optional[RepeatGroup] = attr.ib(default=None, hash=False, eq=False, repr=False)
 
     @property
     def length(self):
@@ -612,7 +646,7 @@ class RSEInstrument:
 @hashableAttrs(repr=False)
 class TrackRSE:
     instrument: RSEInstrument = attr.Factory(RSEInstrument)
-    equalizer: RSEEqualizer = attr.Factory(RSEEqualizer)
+    equalizer: RSEEqualizer = attr.Factory(lambda: RSEEqualizer(knobs=[0.0] * 3))
     humanize: int = 0
     autoAccentuation: Accentuation = Accentuation.none
 
@@ -651,6 +685,16 @@ class Track:
     rse: TrackRSE = attr.Factory(TrackRSE)
 
 
+_NOTES_SHARP = tuple('C C# D D# E F F# G G# A A# B'.split())
+_NOTES_FLAT = tuple('C Db D Eb E F Gb G Ab A Bb B'.split())
+# Note name to its semitone and accidental.
+_NOTE_NAMES = {name: (value, -1 if name.endswith('b') else 1 if name.endswith('#') else 0)
+               for notes in (_NOTES_SHARP, _NOTES_FLAT)
+               for value, name in enumerate(notes)}
+# Accidental of each semitone spelled with sharps.
+_SHARP_ACCIDENTALS = tuple(_NOTE_NAMES[name][1] for name in _NOTES_SHARP)
+
+
 @hashableAttrs
 class GuitarString:
     """A guitar string with a special tuning."""
@@ -659,9 +703,8 @@ class GuitarString:
     value: int
 
     def __str__(self):
-        notes = 'C C# D D# E F F# G G# A A# B'.split()
         octave, semitone = divmod(self.value, 12)
-        return f'{notes[semitone]}{octave-1}'
+        return f'{_NOTES_SHARP[semitone]}{octave-1}'
 
 
 class MeasureClef(Enum):
@@ -684,6 +727,23 @@ class LineBreak(Enum):
     protect = 2
 
 
+class _HeaderAttr:
+    """Forward attribute access on a measure to its header."""
+
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj.header, self.name)
+
+    def __set__(self, obj, value):
+        setattr(obj.header, self.name, value)
+
+
 @hashableAttrs(repr=False)
 class Measure:
     """A measure contains multiple voices of beats."""
@@ -700,27 +760,16 @@ class Measure:
     def isEmpty(self):
         return all(voice.isEmpty for voice in self.voices)
 
-    def _promote_header_attr(name):
-        def fget(self):
-            return getattr(self.header, name)
-
-        def fset(self, value):
-            setattr(self.header, name, value)
-
-        return property(fget, fset)
-
-    number = _promote_header_attr('number')
-    keySignature = _promote_header_attr('keySignature')
-    repeatClose = _promote_header_attr('repeatClose')
-    start = _promote_header_attr('start')
-    end = _promote_header_attr('end')
-    length = _promote_header_attr('length')
-    timeSignature = _promote_header_attr('timeSignature')
-    isRepeatOpen = _promote_header_attr('isRepeatOpen')
-    tripletFeel = _promote_header_attr('tripletFeel')
-    marker = _promote_header_attr('marker')
-
-    del _promote_header_attr
+    number = _HeaderAttr('number')
+    keySignature = _HeaderAttr('keySignature')
+    repeatClose = _HeaderAttr('repeatClose')
+    start = _HeaderAttr('start')
+    end = _HeaderAttr('end')
+    length = _HeaderAttr('length')
+    timeSignature = _HeaderAttr('timeSignature')
+    isRepeatOpen = _HeaderAttr('isRepeatOpen')
+    tripletFeel = _HeaderAttr('tripletFeel')
+    marker = _HeaderAttr('marker')
 
 
 class VoiceDirection(Enum):
@@ -815,14 +864,14 @@ class BeatEffect:
 
     @property
     def isDefault(self):
-        default = BeatEffect()
-        return (self.stroke == default.stroke and
-                self.hasRasgueado == default.hasRasgueado and
-                self.pickStroke == default.pickStroke and
-                self.fadeIn == default.fadeIn and
-                self.vibrato == default.vibrato and
-                self.tremoloBar == default.tremoloBar and
-                self.slapEffect == default.slapEffect)
+        return _beatEffectFields(self) == _DEFAULT_BEAT_EFFECT_FIELDS
+
+
+# Fields checked by BeatEffect.isDefault. Comparing them as one tuple
+# against the defaults runs in C and short-circuits on identical values.
+_beatEffectFields = attrgetter('stroke', 'hasRasgueado', 'pickStroke', 'fadeIn', 'vibrato', 'tremoloBar',
+                               'slapEffect')
+_DEFAULT_BEAT_EFFECT_FIELDS = _beatEffectFields(BeatEffect())
 
 
 class TupletBracket(Enum):
@@ -902,37 +951,30 @@ class HarmonicEffect:
 
 @hashableAttrs
 class NaturalHarmonic(HarmonicEffect):
-    def __attrs_post_init__(self):
-        self.type = 1
+    type: int = attr.ib(default=1, init=False)
 
 
 @hashableAttrs
 class ArtificialHarmonic(HarmonicEffect):
+    type: int = attr.ib(default=2, init=False)
     pitch: Optional['PitchClass'] = None
     octave: Optional[int] = None
 
-    def __attrs_post_init__(self):
-        self.type = 2
-
 
 @hashableAttrs
 class TappedHarmonic(HarmonicEffect):
+    type: int = attr.ib(default=3, init=False)
     fret: Optional[int] = None
 
-    def __attrs_post_init__(self):
-        self.type = 3
-
 
 @hashableAttrs
 class PinchHarmonic(HarmonicEffect):
-    def __attrs_post_init__(self):
-        self.type = 4
+    type: int = attr.ib(default=4, init=False)
 
 
 @hashableAttrs
 class SemiHarmonic(HarmonicEffect):
-    def __attrs_post_init__(self):
-        self.type = 5
+    type: int = attr.ib(default=5, init=False)
 
 
 class GraceEffectTransition(Enum):
@@ -1078,20 +1120,14 @@ class NoteEffect:
 
     @property
     def isDefault(self):
-        default = NoteEffect()
-        return (self.leftHandFinger == default.leftHandFinger and
-                self.rightHandFinger == default.rightHandFinger and
-                self.bend == default.bend and
-                self.harmonic == default.harmonic and
-                self.grace == default.grace and
-                self.trill == default.trill and
-                self.tremoloPicking == default.tremoloPicking and
-                self.vibrato == default.vibrato and
-                self.slides == default.slides and
-                self.hammer == default.hammer and
-                self.palmMute == default.palmMute and
-                self.staccato == default.staccato and
-                self.letRing == default.letRing)
+        return not self.slides and _noteEffectFields(self) == _DEFAULT_NOTE_EFFECT_FIELDS
+
+
+# See _beatEffectFields. Slides are checked for emptiness separately to
+# avoid keeping the default instance's mutable list around for comparison.
+_noteEffectFields = attrgetter('bend', 'harmonic', 'grace', 'trill', 'tremoloPicking', 'vibrato', 'hammer',
+                               'palmMute', 'letRing', 'staccato', 'leftHandFinger', 'rightHandFinger')
+_DEFAULT_NOTE_EFFECT_FIELDS = _noteEffectFields(NoteEffect())
 
 
 class NoteType(LenientEnum):
@@ -1113,6 +1149,9 @@ class Note:
     durationPercent: float = 1.0
     swapAccidentals: bool = False
     type: NoteType = NoteType.rest
+    # Time-independent duration and tuplet of the note in GP3 and GP4
+    duration: Optional[int] = attr.ib(default=None, hash=False, eq=False, repr=False)
+    tuplet: Optional[int] = attr.ib(default=None, hash=False, eq=False, repr=False)
 
     @property
     def realValue(self):
@@ -1292,34 +1331,24 @@ class PitchClass:
     intonation: Optional[str] = None
 
     _notes = {
-        'sharp': 'C C# D D# E F F# G G# A A# B'.split(),
-        'flat': 'C Db D Eb E F Gb G Ab A Bb B'.split(),
+        'sharp': _NOTES_SHARP,
+        'flat': _NOTES_FLAT,
     }
 
     def __attrs_post_init__(self):
-        if self.accidental is None:
-            if isinstance(self.just, str):
-                # Assume string input
-                string = self.just
-                try:
-                    value = self._notes['sharp'].index(string)
-                except ValueError:
-                    value = self._notes['flat'].index(string)
-            elif isinstance(self.just, int):
-                value = self.just % 12
-                try:
-                    string = self._notes['sharp'][value]
-                except KeyError:
-                    string = self._notes['flat'][value]
-            if string.endswith('b'):
-                accidental = -1
-            elif string.endswith('#'):
-                accidental = 1
-            else:
-                accidental = 0
-            pitch = value - accidental
-        else:
+        if self.accidental is not None:
             pitch, accidental = self.just, self.accidental
+        elif isinstance(self.just, int):
+            # Readers always pass semitones
+            value = self.just % 12
+            accidental = _SHARP_ACCIDENTALS[value]
+            pitch = value - accidental
+        elif isinstance(self.just, str):
+            try:
+                value, accidental = _NOTE_NAMES[self.just]
+            except KeyError:
+                raise ValueError(f'unknown note name {self.just!r}') from None
+            pitch = value - accidental
 
         self.just = pitch % 12
         self.accidental = accidental
@@ -1345,9 +1374,13 @@ class MixTableItem:
     allTracks: bool = False
 
 
+_WAH_OFF = -2
+_WAH_NONE = -1
+
+
 @hashableAttrs
 class WahEffect:
-    value: int = attr.ib(default=-1)
+    value: int = attr.ib(default=_WAH_NONE)
     display: bool = False
 
     @value.validator
@@ -1356,17 +1389,17 @@ class WahEffect:
             raise ValueError('value must be in range from -2 to 100')
 
     def isOff(self):
-        return self.value == WahEffect.off.value
+        return self.value == _WAH_OFF
 
     def isNone(self):
-        return self.value == WahEffect.none.value
+        return self.value == _WAH_NONE
 
     def isOn(self):
         return 0 <= self.value <= 100
 
 
-WahEffect.off = WahEffect(-2)
-WahEffect.none = WahEffect(-1)
+WahEffect.off = WahEffect(_WAH_OFF)
+WahEffect.none = WahEffect(_WAH_NONE)
 
 
 @hashableAttrs
@@ -1460,7 +1493,7 @@ class BendPoint:
         :param duration: the full duration of the effect.
         """
 
-        return int(duration * self.position / BendEffect.maxPosition)
+        return int(duration * self.position // BendEffect.maxPosition)
 
 
 @hashableAttrs
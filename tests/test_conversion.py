@@ -192,3 +192,44 @@ def testSongNewMeasure(tmpdir):
     assert len(song2.measureHeaders) == 2
     assert len(song2.tracks[0].measures) == 2
     assert song == song2
+
+
+def testWriteThroughGPFile(tmpdir):
+    songA = gp.parse(LOCATION / 'Effects.gp5')
+    destpath = str(tmpdir.join('Effects.gp5'))
+    with open(destpath, 'wb') as fp:
+        with gp.gp5.GP5File(fp, 'cp1252', version=songA.version, versionTuple=songA.versionTuple) as gpfile:
+            gpfile.writeSong(songA)
+    songB = gp.parse(destpath)
+    assert songA == songB
+
+
+def testWriteThroughGPFileOverContent():
+    songA = gp.parse(LOCATION / 'Effects.gp5')
+    stream = io.BytesIO(b'JUNK')
+    gpfile = gp.gp5.GP5File(stream, 'cp1252', version=songA.version, versionTuple=songA.versionTuple)
+    gpfile.writeSong(songA)
+    gpfile.flush()
+    stream.seek(0)
+    songB = gp.parse(stream)
+    assert songA == songB
+
+
+@pytest.mark.parametrize('filename', ['Effects.gp3', 'Effects.gp4', 'Effects.gp5'])
+def testWriteSongFlushes(filename):
+    songA = gp.parse(LOCATION / filename)
+    stream = io.BytesIO()
+    GPFile = gp.io.getVersionAndGPFile(songA.version)[1]
+    GPFile(stream, 'cp1252', version=songA.version, versionTuple=songA.versionTuple).writeSong(songA)
+    stream.seek(0)
+    songB = gp.parse(stream)
+    assert songA == songB
+
+
+def testReadThroughGPFile():
+    songA = gp.parse(LOCATION / 'Effects.gp3')
+    with open(LOCATION / 'Effects.gp3', 'rb') as fp:
+        fp.seek(31)  # Skip the version string
+        gpfile = gp.gp3.GP3File(fp, 'cp1252', version=songA.version, versionTuple=songA.versionTuple)
+        songB = gpfile.readSong()
+    assert songA == songB
@@ -16,10 +16,20 @@ def testHashable():
     assert coda != segno
     assert hash(coda) != hash(segno)
 
+    class Strings(list):
+        pass
+
+    chord = gp.Chord(6, strings=Strings([0, 2, 2, 1, 0, 0]))
+    assert hash(chord) == hash(gp.Chord(6, strings=[0, 2, 2, 1, 0, 0]))
+    hash(gp.DirectionSign(['Coda']))
+
+    assert hash(gp.Point(1, 2)) != hash(gp.Tuplet(1, 2))
+    assert hash(gp.Point(1, 2)) != hash((1, 2))
+
 
 @pytest.mark.parametrize('value', [1, 2, 4, 8, 16, 32, 64])
 @pytest.mark.parametrize('isDotted', [False, True])
-@pytest.mark.parametrize('tuplet', gp.Tuplet.supportedTuplets)
+@pytest.mark.parametrize('tuplet', sorted(gp.Tuplet.supportedTuplets))
 def testDuration(value, isDotted, tuplet):
     dur = gp.Duration(value, isDotted=isDotted, tuplet=gp.Tuplet(*tuplet))
     time = dur.time
@@ -28,6 +38,26 @@ def testDuration(value, isDotted, tuplet):
     assert time == newDur.time
 
 
+@pytest.mark.parametrize('index, value', list(enumerate([1, 2, 4, 8, 16, 32, 64, 128])))
+def testDurationIndex(index, value):
+    assert gp.Duration(value).index == index
+
+
+def testClamp():
+    assert list(gp.utils.clamp([1, 2, 3], 2)) == [1, 2]
+    assert list(gp.utils.clamp([1, 2], 4, fillvalue=0)) == [1, 2, 0, 0]
+    assert list(gp.utils.clamp([1, 2], 0)) == []
+    assert list(gp.utils.clamp([1, 2], -1)) == []
+
+
+def testBendPointTime():
+    point = gp.BendPoint(position=6)
+    assert point.getTime(960) == 480
+    time = point.getTime(960.0)
+    assert time == 480
+    assert isinstance(time, int)
+
+
 def testGraceDuration():
     g16 = gp.GraceEffect(duration=16)
     assert g16.durationTime == 240
@@ -55,3 +85,11 @@ def testGuitarString():
     assert str(gp.GuitarString(number=1, value=0)) == 'C-1'
     assert str(gp.GuitarString(number=1, value=40)) == 'E2'
     assert str(gp.GuitarString(number=1, value=64)) == 'E4'
+
+
+def testLyrics():
+    lyrics = gp.Lyrics()
+    assert str(lyrics) == ''
+    lyrics.lines[0].lyrics = 'Hello\r\nworld'
+    lyrics.lines[2].lyrics = 'again '
+    assert str(lyrics) == 'Hello  world  again'